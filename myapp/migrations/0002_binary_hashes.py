@@ -0,0 +1,164 @@
+# Generated by Django 5.1 on 2026-10-15 09:12
+
+from django.db import migrations, models
+
+
+HASH_FIELDS = {
+    'Block': ['block_hash', 'parentHash', 'stateRoot', 'extrinsicsRoot'],
+    'Extrinsic': ['hash'],
+}
+BATCH_SIZE = 5000
+
+
+def copy_hashes(apps, convert, source_suffix, target_suffix):
+    for model_name, field_names in HASH_FIELDS.items():
+        model = apps.get_model('myapp', model_name)
+        target_fields = [name + target_suffix for name in field_names]
+        objs = []
+        for obj in model.objects.iterator():
+            for name in field_names:
+                setattr(obj, name + target_suffix, convert(getattr(obj, name + source_suffix)))
+            objs.append(obj)
+            if len(objs) >= BATCH_SIZE:
+                model.objects.bulk_update(objs, target_fields)
+                objs = []
+        model.objects.bulk_update(objs, target_fields)
+
+
+def hashes_to_bytes(apps, schema_editor):
+    copy_hashes(apps, lambda value: bytes.fromhex(value.removeprefix('0x')), '', '_bytes')
+
+
+def hashes_to_hex(apps, schema_editor):
+    copy_hashes(apps, lambda value: '0x' + bytes(value).hex(), '_bytes', '')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('myapp', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='block',
+            name='block_hash_bytes',
+            field=models.BinaryField(max_length=32, null=True),
+        ),
+        migrations.AddField(
+            model_name='block',
+            name='parentHash_bytes',
+            field=models.BinaryField(max_length=32, null=True),
+        ),
+        migrations.AddField(
+            model_name='block',
+            name='stateRoot_bytes',
+            field=models.BinaryField(max_length=32, null=True),
+        ),
+        migrations.AddField(
+            model_name='block',
+            name='extrinsicsRoot_bytes',
+            field=models.BinaryField(max_length=32, null=True),
+        ),
+        migrations.AddField(
+            model_name='extrinsic',
+            name='hash_bytes',
+            field=models.BinaryField(max_length=32, null=True),
+        ),
+        migrations.AlterField(
+            model_name='block',
+            name='block_hash',
+            field=models.CharField(max_length=100, null=True),
+        ),
+        migrations.AlterField(
+            model_name='block',
+            name='parentHash',
+            field=models.CharField(max_length=100, null=True),
+        ),
+        migrations.AlterField(
+            model_name='block',
+            name='stateRoot',
+            field=models.CharField(max_length=100, null=True),
+        ),
+        migrations.AlterField(
+            model_name='block',
+            name='extrinsicsRoot',
+            field=models.CharField(max_length=100, null=True),
+        ),
+        migrations.AlterField(
+            model_name='extrinsic',
+            name='hash',
+            field=models.CharField(max_length=64, null=True),
+        ),
+        migrations.RunPython(hashes_to_bytes, hashes_to_hex),
+        migrations.RemoveField(
+            model_name='block',
+            name='block_hash',
+        ),
+        migrations.RenameField(
+            model_name='block',
+            old_name='block_hash_bytes',
+            new_name='block_hash',
+        ),
+        migrations.AlterField(
+            model_name='block',
+            name='block_hash',
+            field=models.BinaryField(max_length=32, unique=True),
+        ),
+        migrations.RemoveField(
+            model_name='block',
+            name='parentHash',
+        ),
+        migrations.RenameField(
+            model_name='block',
+            old_name='parentHash_bytes',
+            new_name='parentHash',
+        ),
+        migrations.AlterField(
+            model_name='block',
+            name='parentHash',
+            field=models.BinaryField(max_length=32),
+        ),
+        migrations.RemoveField(
+            model_name='block',
+            name='stateRoot',
+        ),
+        migrations.RenameField(
+            model_name='block',
+            old_name='stateRoot_bytes',
+            new_name='stateRoot',
+        ),
+        migrations.AlterField(
+            model_name='block',
+            name='stateRoot',
+            field=models.BinaryField(max_length=32),
+        ),
+        migrations.RemoveField(
+            model_name='block',
+            name='extrinsicsRoot',
+        ),
+        migrations.RenameField(
+            model_name='block',
+            old_name='extrinsicsRoot_bytes',
+            new_name='extrinsicsRoot',
+        ),
+        migrations.AlterField(
+            model_name='block',
+            name='extrinsicsRoot',
+            field=models.BinaryField(max_length=32),
+        ),
+        migrations.RemoveField(
+            model_name='extrinsic',
+            name='hash',
+        ),
+        migrations.RenameField(
+            model_name='extrinsic',
+            old_name='hash_bytes',
+            new_name='hash',
+        ),
+        migrations.AlterField(
+            model_name='extrinsic',
+            name='hash',
+            field=models.BinaryField(max_length=32, unique=True),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.1 on 2026-10-15 09:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('myapp', '0002_binary_hashes'),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name='extrinsic',
+            constraint=models.UniqueConstraint(fields=('block', 'idx'), name='uniq_block_idx'),
+        ),
+    ]
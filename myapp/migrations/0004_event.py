@@ -0,0 +1,60 @@
+# Generated by Django 5.1 on 2026-10-15 10:27
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def events_to_rows(apps, schema_editor):
+    Extrinsic = apps.get_model('myapp', 'Extrinsic')
+    Event = apps.get_model('myapp', 'Event')
+    event_rows = []
+    extrinsics = Extrinsic.objects.filter(events_json__isnull=False).exclude(events_json=None)
+    for extrinsic_id, events in extrinsics.values_list('id', 'events_json').iterator():
+        for event in events:
+            event_rows.append(Event(extrinsic_id=extrinsic_id, event_id=event['event_id'], value=event))
+    Event.objects.bulk_create(event_rows, batch_size=5000)
+
+
+def rows_to_events(apps, schema_editor):
+    Extrinsic = apps.get_model('myapp', 'Extrinsic')
+    Event = apps.get_model('myapp', 'Event')
+    events_by_extrinsic = {}
+    for extrinsic_id, value in Event.objects.order_by('id').values_list('extrinsic_id', 'value').iterator():
+        events_by_extrinsic.setdefault(extrinsic_id, []).append(value)
+    extrinsics = []
+    for extrinsic in Extrinsic.objects.only('id').iterator():
+        extrinsic.events_json = events_by_extrinsic.get(extrinsic.id, [])
+        extrinsics.append(extrinsic)
+        if len(extrinsics) >= 5000:
+            Extrinsic.objects.bulk_update(extrinsics, ['events_json'])
+            extrinsics = []
+    Extrinsic.objects.bulk_update(extrinsics, ['events_json'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('myapp', '0003_extrinsic_uniq_block_idx'),
+    ]
+
+    operations = [
+        migrations.RenameField(
+            model_name='extrinsic',
+            old_name='events',
+            new_name='events_json',
+        ),
+        migrations.CreateModel(
+            name='Event',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('event_id', models.CharField(db_index=True, max_length=64)),
+                ('value', models.JSONField(null=True)),
+                ('extrinsic', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='events', to='myapp.extrinsic')),
+            ],
+        ),
+        migrations.RunPython(events_to_rows, rows_to_events),
+        migrations.RemoveField(
+            model_name='extrinsic',
+            name='events_json',
+        ),
+    ]
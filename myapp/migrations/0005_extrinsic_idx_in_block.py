@@ -0,0 +1,59 @@
+# Generated by Django 5.1 on 2026-10-15 11:03
+
+from django.db import migrations, models
+
+
+BATCH_SIZE = 5000
+
+
+def update_extrinsics(apps, field_name, compute):
+    Extrinsic = apps.get_model('myapp', 'Extrinsic')
+    extrinsics = []
+    for extrinsic in Extrinsic.objects.iterator():
+        setattr(extrinsic, field_name, compute(extrinsic))
+        extrinsics.append(extrinsic)
+        if len(extrinsics) >= BATCH_SIZE:
+            Extrinsic.objects.bulk_update(extrinsics, [field_name])
+            extrinsics = []
+    Extrinsic.objects.bulk_update(extrinsics, [field_name])
+
+
+def idx_to_int(apps, schema_editor):
+    update_extrinsics(apps, 'idx_in_block', lambda extrinsic: int(extrinsic.idx.rsplit('-', 1)[1]))
+
+
+def int_to_idx(apps, schema_editor):
+    update_extrinsics(apps, 'idx', lambda extrinsic: f"{extrinsic.block_id}-{extrinsic.idx_in_block:04}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('myapp', '0004_event'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='extrinsic',
+            name='idx_in_block',
+            field=models.PositiveSmallIntegerField(null=True),
+        ),
+        migrations.RunPython(idx_to_int, int_to_idx),
+        migrations.RemoveConstraint(
+            model_name='extrinsic',
+            name='uniq_block_idx',
+        ),
+        migrations.RemoveField(
+            model_name='extrinsic',
+            name='idx',
+        ),
+        migrations.AlterField(
+            model_name='extrinsic',
+            name='idx_in_block',
+            field=models.PositiveSmallIntegerField(),
+        ),
+        migrations.AddConstraint(
+            model_name='extrinsic',
+            constraint=models.UniqueConstraint(fields=('block', 'idx_in_block'), name='uniq_block_idx'),
+        ),
+    ]
@@ -2,10 +2,10 @@ from django.db import models
 
 class Block(models.Model):
     block_id = models.IntegerField(unique = True)
-    block_hash = models.CharField(max_length=100, unique=True)
-    parentHash = models.CharField(max_length=100)
-    stateRoot = models.CharField(max_length=100)
-    extrinsicsRoot = models.CharField(max_length=100)
+    block_hash = models.BinaryField(max_length=32, unique=True)
+    parentHash = models.BinaryField(max_length=32)
+    stateRoot = models.BinaryField(max_length=32)
+    extrinsicsRoot = models.BinaryField(max_length=32)
     # digest = models.JSONField(null = True)
     timestamp = models.DateTimeField(null=True)
 
@@ -19,10 +19,10 @@ class Call(models.Model):
 
 class Extrinsic(models.Model):
     netuid = models.IntegerField(null = True)  
-    hash = models.CharField(max_length=64, unique=True)  
+    hash = models.BinaryField(max_length=32, unique=True)  
     address = models.CharField(max_length=255, null = True)  
     block = models.ForeignKey(Block, on_delete=models.CASCADE, to_field='block_id', related_name='extrinsics')
-    idx = models.CharField(max_length= 12, null = True)  
+    idx_in_block = models.PositiveSmallIntegerField()
     signature = models.JSONField(null = True)  
     tip = models.IntegerField(null = True)  
     nonce = models.IntegerField(null = True)  
@@ -30,9 +30,19 @@ class Extrinsic(models.Model):
     call_index = models.ForeignKey(Call, on_delete=models.CASCADE, to_field='call_index', related_name='extrinsics')
     call_args = models.JSONField(null = True)  
     result = models.CharField(max_length=20, null = True)  
-    events = models.JSONField(null = True)  
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['block', 'idx_in_block'], name='uniq_block_idx'),
+        ]
+
     def __str__(self):
         return f'Extrinsic {self.hash} at block {self.block_number}'
+
+class Event(models.Model):
+    extrinsic = models.ForeignKey(Extrinsic, on_delete=models.CASCADE, related_name='events')
+    event_id = models.CharField(max_length=64, db_index=True)
+    value = models.JSONField(null = True)
     
 
 
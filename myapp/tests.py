@@ -1,3 +1,67 @@
+from types import SimpleNamespace
+
 from django.test import TestCase
 
-# Create your tests here.
+from myapp.models import Block, Call, Event, Extrinsic
+from substrate_script import build_extrinsic_rows, insert_events, insert_extrinsics
+
+
+class InsertExtrinsicsTests(TestCase):
+    def setUp(self):
+        Block.objects.create(
+            block_id=3593992,
+            block_hash=bytes(32),
+            parentHash=bytes(32),
+            stateRoot=bytes(32),
+            extrinsicsRoot=bytes(32),
+        )
+        Call.objects.create(call_index='0x0702', call_function='add_stake', call_module='SubtensorModule')
+
+    def test_signed_extrinsic_with_mortal_era(self):
+        signature = {'Sr25519': '0x' + 'ab' * 64}
+        extrinsic_value = {
+            'extrinsic_hash': '0x' + '11' * 32,
+            'address': '5GrwvaEF5zXb26Fz9rcQpDWS57CtERHpNehXCPcNoHGKutQY',
+            'signature': signature,
+            'era': (64, 12),
+            'nonce': 7,
+            'tip': 0,
+            'call': {
+                'call_index': '0x0702',
+                'call_function': 'add_stake',
+                'call_module': 'SubtensorModule',
+                'call_args': [{'name': 'netuid', 'type': 'u16', 'value': 3}],
+            },
+        }
+        events = [SimpleNamespace(value={'extrinsic_idx': 1, 'event_id': 'ExtrinsicSuccess'})]
+
+        extrinsic_rows, _ = build_extrinsic_rows([None, extrinsic_value], events, 3593992)
+        insert_extrinsics(extrinsic_rows)
+
+        extrinsic = Extrinsic.objects.get()
+        self.assertEqual(extrinsic.era, '(64, 12)')
+        self.assertEqual(extrinsic.signature, signature)
+        self.assertEqual(extrinsic.call_args, extrinsic_value['call']['call_args'])
+        self.assertEqual(bytes(extrinsic.hash), bytes.fromhex('11' * 32))
+        self.assertEqual(extrinsic.netuid, 3)
+        self.assertEqual(extrinsic.idx_in_block, 1)
+        self.assertEqual(extrinsic.result, 'success')
+
+    def test_events_of_skipped_extrinsic_are_dropped(self):
+        call = {'call_index': '0x0702', 'call_function': 'add_stake', 'call_module': 'SubtensorModule', 'call_args': []}
+        extrinsic_values = [
+            {'extrinsic_hash': '0x' + '22' * 32, 'call': call},
+            {'extrinsic_hash': '0x' + '22' * 32, 'call': call},
+        ]
+        events = [
+            SimpleNamespace(value={'extrinsic_idx': 0, 'event_id': 'ExtrinsicSuccess'}),
+            SimpleNamespace(value={'extrinsic_idx': 1, 'event_id': 'ExtrinsicFailed'}),
+        ]
+
+        extrinsic_rows, extrinsic_events_rows = build_extrinsic_rows(extrinsic_values, events, 3593992)
+        insert_extrinsics(extrinsic_rows)
+        insert_events(extrinsic_events_rows)
+
+        extrinsic = Extrinsic.objects.get()
+        self.assertEqual(extrinsic.idx_in_block, 0)
+        self.assertEqual(list(Event.objects.values_list('extrinsic_id', 'event_id')), [(extrinsic.id, 'ExtrinsicSuccess')])
@@ -1,7 +1,13 @@
 import os
 import sys
-from datetime import datetime
-import pytz
+import json
+import types
+import queue
+import threading
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+import orjson
 import django
 
 # Set up Django environment
@@ -9,9 +15,36 @@ sys.path.append('/Users/mac/Library/Python/3.9/lib/python/site-packages')
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'myproject.settings')
 django.setup()
 
-from myapp.models import Extrinsic, Block, Call
+from django.db import connection, transaction
+from django.db.models import Max
+from myapp.models import Extrinsic, Block, Call, Event
+import substrateinterface.base as substrate_base
 from substrateinterface.base import SubstrateInterface
 
+def use_orjson_decoder():
+    """
+    Makes substrateinterface decode WebSocket RPC responses with orjson instead of the stdlib json module.
+    Only the json reference inside substrateinterface.base is swapped; every other attribute still
+    resolves to the stdlib module, so request encoding is unaffected.
+    """
+    fast_json = types.ModuleType('json')
+    fast_json.__dict__.update(json.__dict__)
+    fast_json.loads = orjson.loads
+    substrate_base.json = fast_json
+
+use_orjson_decoder()
+
+START_BLOCK = 3593992
+FETCH_WORKERS = 8
+WRITE_BATCH_SIZE = 64
+QUEUE_MAXSIZE = 256
+EXTRINSIC_COLUMNS = (
+    'hash', 'netuid', 'address', 'block_id', 'idx_in_block', 'signature', 'tip',
+    'nonce', 'era', 'call_index_id', 'call_args', 'result',
+)
+
+_thread_local = threading.local()
+
 def setup_substrate_interface():
     """
     Initializes and returns a SubstrateInterface object configured to connect to a specified WebSocket URL.
@@ -39,27 +72,101 @@ def get_block_data(substrate, block_number):
     events = substrate.get_events(block_hash=block_hash)
     return block, events, block_hash
 
-def extract_block_timestamp(extrinsics):
+def get_thread_substrate():
+    """
+    Returns the SubstrateInterface owned by the calling thread, creating it on first use.
+    A SubstrateInterface wraps a single WebSocket and must not be shared between threads.
+    """
+    substrate = getattr(_thread_local, 'substrate', None)
+    if substrate is None:
+        substrate = _thread_local.substrate = setup_substrate_interface()
+    return substrate
+
+def fetch_block(block_number):
+    """
+    Retrieves block data and events for a given block number over the calling thread's own connection.
+
+    Parameters:
+    block_number (int): The block number to retrieve data for.
+
+    Returns:
+    tuple: Contains the block number, block data, events, and block hash.
+    """
+    block, events, block_hash = get_block_data(get_thread_substrate(), block_number)
+    return block_number, block, events, block_hash
+
+def fetch_blocks(block_numbers):
+    """
+    Retrieves several blocks concurrently, one connection per worker thread, so that their RPC round-trips overlap.
+    Results are yielded in the order of block_numbers, with at most twice FETCH_WORKERS requests in flight.
+
+    Parameters:
+    block_numbers (iterable): The block numbers to retrieve data for.
+
+    Yields:
+    tuple: Contains the block number, block data, events, and block hash.
+    """
+    with ThreadPoolExecutor(max_workers=FETCH_WORKERS) as executor:
+        pending = deque()
+        for block_number in block_numbers:
+            pending.append(executor.submit(fetch_block, block_number))
+            if len(pending) >= FETCH_WORKERS * 2:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+def extract_extrinsic_values(extrinsics):
+    """
+    Unwraps the decoded value of every extrinsic in a block once, so later steps work on plain dicts.
+
+    Parameters:
+    extrinsics (list): A list of extrinsic objects.
+
+    Returns:
+    list: The value of each extrinsic, or None if it could not be decoded, in block order.
+    """
+    return [getattr(extrinsic, 'value', None) for extrinsic in extrinsics]
+
+def extract_block_timestamp(extrinsic_values):
     """
     Extracts the timestamp from a list of extrinsics by identifying the 'set' function call within the 'Timestamp' module.
+    Timestamp.set is an inherent, and inherents always precede signed extrinsics in a block,
+    so the scan stops at the first signed extrinsic.
 
     Parameters:
-    extrinsics (list): A list of extrinsic objects from which to extract the timestamp.
+    extrinsic_values (list): A list of extrinsic values from which to extract the timestamp.
 
     Returns:
     datetime: The extracted timestamp in UTC, or None if not found.
     """
-    for extrinsic in extrinsics:
-        extrinsic_value = getattr(extrinsic, 'value', None)
-        if extrinsic_value and 'call' in extrinsic_value:
+    for extrinsic_value in extrinsic_values:
+        if not extrinsic_value:
+            continue
+        if 'address' in extrinsic_value:
+            break
+        if 'call' in extrinsic_value:
             call = extrinsic_value['call']
             if call['call_function'] == 'set' and call['call_module'] == 'Timestamp':
-                return datetime.fromtimestamp(call['call_args'][0]['value'] / 1000, tz=pytz.UTC)
+                return datetime.fromtimestamp(call['call_args'][0]['value'] / 1000, tz=timezone.utc)
     return None
 
-def create_block_record(block_number, block, block_hash, block_timestamp):
+def hex_to_bytes(value):
+    """
+    Converts a 0x-prefixed hex string, such as a block or extrinsic hash, into raw bytes for storage.
+
+    Parameters:
+    value (str): The hex string to convert.
+
+    Returns:
+    bytes: The decoded bytes, or None if value is None.
+    """
+    if value is None:
+        return None
+    return bytes.fromhex(value.removeprefix('0x'))
+
+def build_block_record(block_number, block, block_hash, block_timestamp):
     """
-    Creates and stores a Block record in the database using the provided block data.
+    Builds an unsaved Block record from the provided block data.
 
     Parameters:
     block_number (int): The block number.
@@ -68,86 +175,115 @@ def create_block_record(block_number, block, block_hash, block_timestamp):
     block_timestamp (datetime): The timestamp of the block.
 
     Returns:
-    Block: The created Block object.
+    Block: The unsaved Block object.
     """
-    return Block.objects.create(
+    return Block(
         block_id=block_number,
-        block_hash=block_hash,
-        parentHash=block['header']['parentHash'],
-        stateRoot=block['header']['stateRoot'],
-        extrinsicsRoot=block['header']['extrinsicsRoot'],
+        block_hash=hex_to_bytes(block_hash),
+        parentHash=hex_to_bytes(block['header']['parentHash']),
+        stateRoot=hex_to_bytes(block['header']['stateRoot']),
+        extrinsicsRoot=hex_to_bytes(block['header']['extrinsicsRoot']),
         timestamp=block_timestamp,
     )
 
-def process_extrinsics(extrinsics, events, block_instance, block_number):
+def build_extrinsic_rows(extrinsic_values, events, block_number):
     """
-    Processes each extrinsic in the block, extracting relevant details and storing them in the database.
-    Also associates each extrinsic with its corresponding events and success status.
+    Processes each extrinsic in the block, extracting relevant details into row tuples ready for insertion.
+    Also determines each extrinsic's success status and collects its corresponding events.
 
     Parameters:
-    extrinsics (list): A list of extrinsic objects.
+    extrinsic_values (list): A list of extrinsic values, as returned by extract_extrinsic_values.
     events (list): A list of event objects associated with the block.
-    block_instance (Block): The Block instance to which these extrinsics belong.
     block_number (int): The block number.
+
+    Returns:
+    tuple: A list with one tuple of decoded values per extrinsic, in EXTRINSIC_COLUMNS order,
+    and a list of ((block number, index in block), events) pairs.
     """
-    for idx, extrinsic in enumerate(extrinsics):
-        extrinsic_value = getattr(extrinsic, 'value', None)
+    events_by_idx, success_bits = index_extrinsic_events(events)
+    extrinsic_rows = []
+    extrinsic_events_rows = []
+    for idx, extrinsic_value in enumerate(extrinsic_values):
         if not extrinsic_value:
             continue
 
-        extrinsic_events, extrinsic_success = extract_extrinsic_events(events, idx)
-        extrinsic_result = 'success' if extrinsic_success else 'failed'
+        extrinsic_events = events_by_idx.get(idx, [])
+        extrinsic_result = 'success' if success_bits >> idx & 1 else 'failed'
         extrinsic_type, extrinsic_netuid = extract_extrinsic_details(extrinsic_value)
 
-        call_index = extrinsic_type[0]
-        call_index_instance = None
-        if call_index:
-            call_type = list(Call.objects.values_list('call_index', flat=True))
-            if call_index not in call_type:
-                Call.objects.create(
-                    call_index=call_index,
-                    call_function=extrinsic_type[1],
-                    call_module=extrinsic_type[2],
-                )
-            call_index_instance = Call.objects.get(call_index=call_index)
-
-        Extrinsic.objects.create(
-            hash=extrinsic_value.get('extrinsic_hash'),
-            netuid=extrinsic_netuid,
-            address=extrinsic_value.get('address'),
-            block=block_instance,
-            idx=f"{block_number}-{idx:04}",
-            signature=extrinsic_value.get('signature'),
-            tip=extrinsic_value.get('tip'),
-            nonce=extrinsic_value.get('nonce'),
-            era=extrinsic_value.get('era'),
-            call_index=call_index_instance,
-            call_args=extrinsic_value.get('call', {}).get('call_args'),
-            result=extrinsic_result,
-            events=extrinsic_events,
-        )
-
-def extract_extrinsic_events(events, idx):
-    """
-    Extracts events related to a specific extrinsic by matching the extrinsic index.
-    Determines whether the extrinsic was successful based on event data.
+        extrinsic_rows.append((
+            hex_to_bytes(extrinsic_value.get('extrinsic_hash')),
+            extrinsic_netuid,
+            extrinsic_value.get('address'),
+            block_number,
+            idx,
+            extrinsic_value.get('signature'),
+            extrinsic_value.get('tip'),
+            extrinsic_value.get('nonce'),
+            extrinsic_value.get('era'),
+            extrinsic_type[0],
+            extrinsic_value.get('call', {}).get('call_args'),
+            extrinsic_result,
+        ))
+        if extrinsic_events:
+            extrinsic_events_rows.append(((block_number, idx), extrinsic_events))
+
+    return extrinsic_rows, extrinsic_events_rows
+
+def collect_calls(extrinsic_values, calls):
+    """
+    Collects the distinct calls made by a block's extrinsics.
+
+    Parameters:
+    extrinsic_values (list): A list of extrinsic values, as returned by extract_extrinsic_values.
+    calls (dict): Maps call index to a (call_function, call_module) tuple; new call indexes are added to it.
+    """
+    for extrinsic_value in extrinsic_values:
+        if not extrinsic_value:
+            continue
+        call = extrinsic_value.get('call', {})
+        call_index = call.get('call_index')
+        if call_index and call_index not in calls:
+            calls[call_index] = (call.get('call_function'), call.get('call_module'))
+
+def ensure_calls(calls):
+    """
+    Creates the Call records that do not exist yet with a single bulk insert.
+
+    Parameters:
+    calls (dict): Maps call index to a (call_function, call_module) tuple, as filled by collect_calls.
+    """
+    Call.objects.bulk_create(
+        [
+            Call(call_index=call_index, call_function=call_function, call_module=call_module)
+            for call_index, (call_function, call_module) in calls.items()
+        ],
+        ignore_conflicts=True,
+    )
+
+def index_extrinsic_events(events):
+    """
+    Groups the events of a block by the index of the extrinsic that emitted them, in a single pass.
+    Also records which extrinsics were successful based on event data.
 
     Parameters:
     events (list): A list of event objects.
-    idx (int): The index of the extrinsic to match events against.
 
     Returns:
-    tuple: A list of matched events and a boolean indicating success.
+    tuple: A dict mapping extrinsic index to its list of events, and a bitset (int) with bit i set
+    if extrinsic i was successful.
     """
-    extrinsic_events = []
-    extrinsic_success = False
+    events_by_idx = defaultdict(list)
+    success_bits = 0
     for event in events:
         event_value = getattr(event, 'value', None)
-        if event_value and event_value.get('extrinsic_idx') == idx:
-            extrinsic_events.append(event_value)
-            if event_value['event_id'] == 'ExtrinsicSuccess':
-                extrinsic_success = True
-    return extrinsic_events, extrinsic_success
+        if not event_value:
+            continue
+        idx = event_value.get('extrinsic_idx')
+        events_by_idx[idx].append(event_value)
+        if event_value['event_id'] == 'ExtrinsicSuccess' and idx is not None:
+            success_bits |= 1 << idx
+    return events_by_idx, success_bits
 
 def extract_extrinsic_details(extrinsic_value):
     """
@@ -161,23 +297,210 @@ def extract_extrinsic_details(extrinsic_value):
     """
     call = extrinsic_value.get('call', {})
     call_args = call.get('call_args', [])
-    extrinsic_netuid = next((arg['value'] for arg in call_args if arg['name'] == 'netuid'), None)
+    args_by_name = {arg['name']: arg['value'] for arg in call_args}
+    extrinsic_netuid = args_by_name.get('netuid')
     extrinsic_type = [call.get('call_index'), call.get('call_function'), call.get('call_module')]
     return extrinsic_type, extrinsic_netuid
 
+def insert_extrinsics(extrinsic_rows):
+    """
+    Inserts extrinsic rows with a single prepared INSERT executed for every row, skipping rows that
+    conflict with existing ones. This bypasses model instantiation; each value is still converted by
+    its model field, so e.g. a mortal era tuple is stored as text and JSON columns are serialized.
+
+    Parameters:
+    extrinsic_rows (list): Row tuples, as returned by build_extrinsic_rows.
+    """
+    if not extrinsic_rows:
+        return
+    fields = [Extrinsic._meta.get_field(column) for column in EXTRINSIC_COLUMNS]
+    quote_name = connection.ops.quote_name
+    sql = "INSERT INTO %s (%s) VALUES (%s) ON CONFLICT DO NOTHING" % (
+        quote_name(Extrinsic._meta.db_table),
+        ', '.join(quote_name(field.column) for field in fields),
+        ', '.join(['%s'] * len(fields)),
+    )
+    prepared_rows = [
+        tuple(field.get_db_prep_save(value, connection) for field, value in zip(fields, row))
+        for row in extrinsic_rows
+    ]
+    with connection.cursor() as cursor:
+        cursor.executemany(sql, prepared_rows)
+
+def get_extrinsic_ids(block_numbers):
+    """
+    Maps every stored extrinsic of the given blocks to its id, keyed by its position in the block.
+
+    Parameters:
+    block_numbers (iterable): The block numbers whose extrinsics to look up.
+
+    Returns:
+    dict: Maps (block number, index in block) to Extrinsic id.
+    """
+    return {
+        (block_id, idx_in_block): extrinsic_id
+        for block_id, idx_in_block, extrinsic_id in Extrinsic.objects.filter(
+            block_id__in=block_numbers,
+        ).values_list('block_id', 'idx_in_block', 'id')
+    }
+
+def insert_events(extrinsic_events_rows):
+    """
+    Stores the events of freshly inserted extrinsics as Event records with a single bulk insert.
+    Events of extrinsics whose row was skipped on a hash conflict are dropped, so they never attach to another extrinsic.
+
+    Parameters:
+    extrinsic_events_rows (list): ((block number, index in block), events) pairs, as returned by build_extrinsic_rows.
+    """
+    if not extrinsic_events_rows:
+        return
+    extrinsic_ids = get_extrinsic_ids({block_number for (block_number, _), _ in extrinsic_events_rows})
+    Event.objects.bulk_create(
+        [
+            Event(extrinsic_id=extrinsic_ids[extrinsic_key], event_id=event['event_id'], value=event)
+            for extrinsic_key, extrinsic_events in extrinsic_events_rows
+            if extrinsic_key in extrinsic_ids
+            for event in extrinsic_events
+        ],
+        batch_size=5000,
+    )
+
+def ingest_blocks(batch):
+    """
+    Stores a batch of blocks, their extrinsics and events in the database in a single transaction,
+    with one bulk insert each for the blocks, new calls and events, and one batched INSERT for the extrinsics.
+
+    Parameters:
+    batch (list): Tuples of block number, block data, events, and block hash, as returned by fetch_block.
+    """
+    block_instances = []
+    extrinsic_rows = []
+    extrinsic_events_rows = []
+    calls = {}
+    for block_number, block, events, block_hash in batch:
+        extrinsic_values = extract_extrinsic_values(block['extrinsics'])
+        block_timestamp = extract_block_timestamp(extrinsic_values)
+        collect_calls(extrinsic_values, calls)
+        block_instances.append(build_block_record(block_number, block, block_hash, block_timestamp))
+        block_extrinsic_rows, block_events_rows = build_extrinsic_rows(extrinsic_values, events, block_number)
+        extrinsic_rows.extend(block_extrinsic_rows)
+        extrinsic_events_rows.extend(block_events_rows)
+
+    with transaction.atomic():
+        Block.objects.bulk_create(block_instances)
+        ensure_calls(calls)
+        insert_extrinsics(extrinsic_rows)
+        insert_events(extrinsic_events_rows)
+
+def write_worker(block_queue):
+    """
+    Drains fetched blocks from the queue and stores them in batches of up to WRITE_BATCH_SIZE blocks,
+    so database writes overlap with network fetches. Stops once it receives None.
+
+    Parameters:
+    block_queue (queue.Queue): The queue of fetched blocks, as returned by fetch_block.
+    """
+    try:
+        while True:
+            batch = [block_queue.get()]
+            while len(batch) < WRITE_BATCH_SIZE and not block_queue.empty():
+                batch.append(block_queue.get_nowait())
+            stop = batch[-1] is None
+            if stop:
+                batch.pop()
+            if batch:
+                ingest_blocks(batch)
+            if stop:
+                return
+    finally:
+        connection.close()
+
+def enqueue_block(block_queue, writer, block_data):
+    """
+    Puts fetched block data on the write queue, waiting while the queue is full.
+
+    Parameters:
+    block_queue (queue.Queue): The queue drained by the writer thread.
+    writer (threading.Thread): The thread running write_worker.
+    block_data (tuple): The block data, as returned by fetch_block, or None to stop the writer.
+
+    Raises:
+    RuntimeError: If the writer thread has stopped, so nothing would ever drain the queue.
+    """
+    while True:
+        if not writer.is_alive():
+            raise RuntimeError("Block writer thread stopped unexpectedly")
+        try:
+            block_queue.put(block_data, timeout=1)
+            return
+        except queue.Full:
+            continue
+
+def follow_finalized_heads(substrate, next_block, submit_block):
+    """
+    Subscribes to finalized block headers and fetches each block as soon as it is finalized.
+    Blocks finalized between two notifications, or before the first one, are fetched as well.
+    This call blocks for as long as the subscription is open.
+
+    Parameters:
+    substrate (SubstrateInterface): The interface used to hold the subscription.
+    next_block (int): The first block number that has not been fetched yet.
+    submit_block (callable): Called with the data of every fetched block, as returned by fetch_block.
+    """
+    def on_new_head(obj, update_nr, subscription_id):
+        nonlocal next_block
+        head_number = obj['header']['number']
+        while next_block <= head_number:
+            submit_block(fetch_block(next_block))
+            next_block += 1
+
+    substrate.subscribe_block_headers(on_new_head, finalized_only=True)
+
+def get_resume_block():
+    """
+    Returns the first block number that still has to be ingested, so a restarted run continues
+    after the last stored block instead of re-inserting blocks from START_BLOCK.
+    Batches are written in block order and each one commits atomically, so no earlier block is missing.
+
+    Returns:
+    int: The block number to start ingesting from.
+    """
+    last_block = Block.objects.aggregate(Max('block_id'))['block_id__max']
+    if last_block is None:
+        return START_BLOCK
+    return max(START_BLOCK, last_block + 1)
+
 def main():
     """
     Main function to execute the block processing logic.
-    Sets up the substrate interface, retrieves block data, and processes the block and its extrinsics.
+    Sets up the substrate interface, ingests every block from START_BLOCK (or after the last stored block)
+    up to the current finalized head by fetching several blocks concurrently, then keeps following
+    newly finalized blocks.
+    Fetched blocks are handed to a writer thread that stores them in batches.
     """
-    block_number = 3593992
     substrate = setup_substrate_interface()
-    
-    block, events, block_hash = get_block_data(substrate, block_number)
-    block_timestamp = extract_block_timestamp(block['extrinsics'])
-    
-    block_instance = create_block_record(block_number, block, block_hash, block_timestamp)
-    process_extrinsics(block['extrinsics'], events, block_instance, block_number)
+    finalized_number = substrate.get_block_number(substrate.get_chain_finalised_head())
+    start_block = get_resume_block()
+
+    block_queue = queue.Queue(maxsize=QUEUE_MAXSIZE)
+    writer = threading.Thread(target=write_worker, args=(block_queue,), daemon=True)
+    writer.start()
+
+    def submit_block(block_data):
+        enqueue_block(block_queue, writer, block_data)
+
+    try:
+        for block_data in fetch_blocks(range(start_block, finalized_number + 1)):
+            submit_block(block_data)
+
+        follow_finalized_heads(substrate, max(start_block, finalized_number + 1), submit_block)
+    finally:
+        try:
+            enqueue_block(block_queue, writer, None)
+        except RuntimeError:
+            pass
+        else:
+            writer.join()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file